@@ -3,24 +3,55 @@ import sys
 import time
 import threading
 import subprocess
+import shutil
 import platform
-import difflib
 import queue
+import argparse
+import pickle
+import hashlib
+import signal
+from operator import itemgetter
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path 
-from datetime import datetime, timedelta
-from difflib import SequenceMatcher
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
-from rich.console import Console
+from rich.console import Console, Group
 from rich.tree import Tree
 from rich.live import Live
 from rich.panel import Panel
-from prompt_toolkit import Application
+from rich.layout import Layout
+from rich.text import Text, Span
+from rich.style import Style
+from prompt_toolkit import Application, PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout.containers import Window
 from prompt_toolkit.layout.layout import Layout as PTKLayout
 from prompt_toolkit.keys import Keys
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+try:
+    import miniaudio
+except ImportError:
+    miniaudio = None
+
+try:
+    # C implementation of difflib.SequenceMatcher, same opcodes and semantics
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -32,33 +63,597 @@ def get_resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def _cache_path(directory):
+    """Where the content snapshot for a monitored directory is kept between runs"""
+    if os.name == 'nt':
+        root = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    key = hashlib.sha1(str(directory).encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return Path(root) / "fsar" / f"{key}.pickle"
+
+
+def _load_snapshot(directory):
+    """Return {path: ((st_mtime_ns, st_size), text)} saved by a previous run, or {}"""
+    try:
+        with open(_cache_path(directory), 'rb') as f:
+            snapshot = pickle.load(f)
+        return snapshot if isinstance(snapshot, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_snapshot(directory, snapshot):
+    """Write a snapshot atomically so a crash never leaves a torn file behind"""
+    path = _cache_path(directory)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _decode(data):
+    """Turn file bytes into text the way a text-mode read would: lenient UTF-8, universal newlines"""
+    # Most source files are plain ASCII, which decodes without the UTF-8 state machine
+    text = data.decode('ascii') if data.isascii() else data.decode('utf-8', 'ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _read_or_none(path):
+    """Read a file as text, returning None if it cannot be read"""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except Exception:
+        return None
+    try:
+        # Size the first read from fstat, keep going in case the file grew meanwhile
+        chunks = [os.read(fd, os.fstat(fd).st_size + 1)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 1 << 16))
+        return _decode(b"".join(chunks))
+    except Exception:
+        return None
+    finally:
+        os.close(fd)
+
+
+def _fingerprint(text):
+    """64-bit fingerprint of file content, xxh3 when available"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(text.encode('utf-8', 'ignore'))
+    return hash(text)
+
+
+def _format_size(size):
+    """Human readable file size, e.g. (12B), (3.4KB), (1.2MB)"""
+    if size < 1024:
+        return f"({size}B)"
+    if size < 1024 * 1024:
+        return f"({size/1024:.1f}KB)"
+    return f"({size/(1024*1024):.1f}MB)"
+
+
+def _uring_enabled():
+    """Whether the io_uring fast paths may be used on this system"""
+    return (liburing is not None and sys.platform.startswith('linux')
+            and not os.environ.get('FSAR_DISABLE_IO_URING'))
+
+
+def _uring_ring():
+    """Set up a ring for one thread's batch, preferring the cheaper single-issuer mode
+
+    SINGLE_ISSUER and COOP_TASKRUN need Linux 6.0; older kernels reject
+    them and get a plain ring instead.
+    """
+    ring = liburing.Ring()
+    try:
+        liburing.io_uring_queue_init(_URING_BATCH, ring,
+                                     liburing.IORING_SETUP_SINGLE_ISSUER | liburing.IORING_SETUP_COOP_TASKRUN)
+    except Exception:
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(_URING_BATCH, ring)
+    return ring
+
+
+def _bulk_read(paths):
+    """Read many files as text, returning {path: content or None}
+
+    On Linux with the optional liburing bindings each batch of reads is
+    submitted through io_uring; otherwise the reads overlap on a thread pool.
+    """
+    if _uring_enabled():
+        try:
+            return _bulk_read_uring(paths)
+        except Exception:
+            pass
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return dict(zip(paths, pool.map(_read_or_none, paths, chunksize=32)))
+
+
+def _bulk_read_uring(paths):
+    results = {}
+    pending = {}
+    ring = _uring_ring()
+    cqe = liburing.Cqe()
+    try:
+        for start in range(0, len(paths), _URING_BATCH):
+            for path in paths[start:start + _URING_BATCH]:
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except OSError:
+                    results[path] = None
+                    continue
+                try:
+                    size = os.fstat(fd).st_size
+                except OSError:
+                    size = -1
+                if size <= 0:
+                    os.close(fd)
+                    results[path] = "" if size == 0 else None
+                    continue
+                
+                buf = bytearray(size)
+                key = len(pending)
+                pending[key] = (path, fd, buf)
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_read(sqe, fd, buf, 0)
+                liburing.io_uring_sqe_set_data64(sqe, key)
+            
+            liburing.io_uring_submit(ring)
+            # Completions already in the ring are reaped without entering the kernel
+            for _ in range(len(pending)):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                try:
+                    entry = cqe[0]
+                    path, _, buf = pending[liburing.io_uring_cqe_get_data64(entry)]
+                    # The bindings raise OSError for a failed completion rather than returning -errno
+                    try:
+                        res = entry.res
+                    except OSError:
+                        res = -1
+                    results[path] = _decode(buf[:res]) if res >= 0 else None
+                finally:
+                    liburing.io_uring_cq_advance(ring, 1)
+            
+            for _, fd, _ in pending.values():
+                os.close(fd)
+            pending.clear()
+    finally:
+        # Tear the ring down before releasing descriptors and buffers it may still use
+        liburing.io_uring_queue_exit(ring)
+        for _, fd, _ in pending.values():
+            os.close(fd)
+    return results
+
+
+def _stat_mtimes(paths):
+    """Return {path: st_mtime_ns or None} for many paths at once
+
+    Only the io_uring path batches anything; without it an empty dict is
+    returned and callers stat lazily as they go.
+    """
+    if not paths or not _uring_enabled():
+        return {}
+    try:
+        return _stat_mtimes_uring(paths)
+    except Exception:
+        return {}
+
+
+def _stat_mtimes_uring(paths):
+    results = {}
+    ring = _uring_ring()
+    cqe = liburing.Cqe()
+    try:
+        for start in range(0, len(paths), _URING_BATCH):
+            batch = paths[start:start + _URING_BATCH]
+            bufs = []
+            for key, path in enumerate(batch):
+                buf = liburing.Statx()
+                bufs.append(buf)
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(sqe, buf, path, mask=liburing.STATX_MTIME)
+                liburing.io_uring_sqe_set_data64(sqe, key)
+            
+            liburing.io_uring_submit(ring)
+            for _ in range(len(batch)):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                try:
+                    entry = cqe[0]
+                    key = liburing.io_uring_cqe_get_data64(entry)
+                    # A failed statx raises here, e.g. a cached directory that was renamed away
+                    try:
+                        entry.res
+                        # The binding only exposes mtime as float seconds, so this is exact to the double's ULP
+                        results[batch[key]] = round(bufs[key].mtime * 1e9)
+                    except OSError:
+                        results[batch[key]] = None
+                finally:
+                    liburing.io_uring_cq_advance(ring, 1)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return results
+
+
+def _iter_entries(dir_str):
+    """Yield os.DirEntry objects for a directory, closing the scandir handle when done"""
+    with os.scandir(dir_str) as it:
+        yield from it
+
+
+def _fs_type(path):
+    """Filesystem type of the mount holding path, or None where /proc/self/mountinfo isn't available"""
+    best, fstype = None, None
+    try:
+        with open('/proc/self/mountinfo') as f:
+            for line in f:
+                fields = line.split()
+                # Mount points escape whitespace and backslashes as octal
+                mount = (fields[4].replace('\\040', ' ').replace('\\011', '\t')
+                         .replace('\\012', '\n').replace('\\134', '\\'))
+                prefix = mount if mount.endswith('/') else mount + '/'
+                # Later entries are mounted over earlier ones on the same point
+                if (path == mount or path.startswith(prefix)) and (best is None or len(mount) >= len(best)):
+                    best, fstype = mount, fields[fields.index('-') + 1]
+    except (OSError, ValueError, IndexError):
+        return None
+    return fstype
+
+
+# Window (seconds) over which repeated modify events for a path are coalesced,
+# and the quiet period the display waits for before redrawing after changes
+_DEBOUNCE_SECONDS = 0.1
+
+# Filesystems whose changes made by other machines never reach inotify, watched by polling instead
+_NETWORK_FS = frozenset({'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'fuse.sshfs', '9p', 'afs', 'ceph', 'glusterfs'})
+
+# Entries listed per directory before the rest are summarised in a single row
+_MAX_DIR_ENTRIES = 1000
+
+# Seconds between scans when a directory on a network filesystem is polled
+_POLL_INTERVAL = 2.0
+
+# Longest a continuous burst of events can hold back a redraw (seconds)
+_MAX_RENDER_DELAY = 1.0
+
+# Longest the display loop sleeps with nothing scheduled, polling for resizes where SIGWINCH is missing
+_IDLE_WAKEUP = 2.0 if hasattr(signal, 'SIGWINCH') else 0.5
+
+# Upper bound on text (in characters) held across contents and backups
+_MAX_CONTENT_BYTES = 128 << 20
+
+# Files larger than this (bytes) are not read or diffed, one would flush most of the cache
+_MAX_FILE_BYTES = 16 << 20
+
+# Change records older than this (seconds) are dropped
+_EVENT_RETENTION = 3600
+
+# Reads or stats submitted per io_uring_enter
+_URING_BATCH = 128
+
+# Number of split-line lists kept around for diffing
+_LINES_CACHE_SIZE = 256
+
+# Changed regions longer than this (in lines) aren't aligned line by line
+_MAX_MATCH_LINES = 10000
+
+# Number of computed diffs (and their styled renderings) kept around
+_DIFF_CACHE_SIZE = 128
+
+# Diff line styles, parsed once instead of per line
+_DIFF_STYLE_HEADER = Style(color="blue", bold=True)
+_DIFF_STYLE_HUNK = Style(color="cyan", bold=True)
+_DIFF_STYLE_ADD = Style(color="green")
+_DIFF_STYLE_DEL = Style(color="red")
+_DIFF_STYLE_CONTEXT = Style(dim=True)
+
+# Style by a diff line's first character, '+++'/'---' file headers are told apart separately
+_DIFF_LINE_STYLES = {'+': _DIFF_STYLE_ADD, '-': _DIFF_STYLE_DEL, '@': _DIFF_STYLE_HUNK}
+
+# Menu text never changes, so it is parsed once here rather than on every visit
+_DIR_GONE_HEADER = Text.from_markup("\n[red]⚠️ DIRECTORY DELETED OR MOVED![/red]")
+
+_RECOVERY_MENU = Group(
+    Text.from_markup("\n[yellow]🔧 Recovery Options:[/yellow]"),
+    Text.from_markup("  [cyan]1.[/cyan] Change to a different directory"),
+    Text.from_markup("  [cyan]2.[/cyan] Exit program"),
+)
+
+_MAIN_MENU = Group(
+    Text("\n" + "=" * 60),
+    Text.from_markup("\n[bold yellow]🔧 FSAR MONITOR CONTROLS:[/bold yellow]"),
+    Text("-" * 60 + "\n"),
+    Text.from_markup("  [bold cyan]1.[/bold cyan] Change directory path"),
+    Text.from_markup("  [bold cyan]2.[/bold cyan] Toggle chime notifications"),
+    Text.from_markup("  [bold cyan]3.[/bold cyan] View file diffs"),
+    Text.from_markup("  [bold cyan]4.[/bold cyan] Resume monitoring"),
+    Text.from_markup("  [bold cyan]5.[/bold cyan] Exit"),
+    Text("\n" + "=" * 60),
+)
+
+# Color ladders per event type: (max age in seconds, color), first matching rung wins
+_EVENT_COLORS = {
+    'created': ((2, "bright_green"), (5, "green"), (10, "dark_green")),
+    'modified': ((2, "bright_red"), (5, "red"), (10, "yellow"), (30, "orange3")),
+}
+
+# Ages (seconds) at which a highlighted entry changes color or drops out of the counters
+_FADE_BOUNDARIES = (2, 5, 10, 30)
+
+# Color per age bucket (bisect_right over _FADE_BOUNDARIES) for each event, None once faded
+_EVENT_BUCKET_COLORS = {
+    event: tuple(next((color for limit, color in ladder if lower < limit), None)
+                 for lower in (0,) + _FADE_BOUNDARIES)
+    for event, ladder in _EVENT_COLORS.items()
+}
+
+# Host OS, looked up once rather than per chime
+_SYSTEM = platform.system().lower()
+
+# Command-line players tried in order for the chime on Linux and other Unixes
+_CHIME_PLAYERS = ("mpg123", "mpv", "vlc", "mplayer", "ffplay")
+
+# Bytes that can appear in text files, anything else counts against the probe (as in file(1))
+_TEXT_CHARS = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7f)) | set(range(0x80, 0x100)))
+
+_TEXT_EXTS = frozenset({
+    '.txt', '.py', '.js', '.html', '.css', '.json', '.xml', '.md',
+    '.yml', '.yaml', '.ini', '.cfg', '.conf', '.log', '.sql', '.sh',
+    '.bat', '.ps1', '.c', '.cpp', '.h', '.java', '.cs', '.go', '.rs',
+    '.php', '.rb', '.pl', '.r', '.swift', '.kt', '.dart', '.ts', '.jsx',
+    '.tsx', '.vue', '.svelte', '.scss', '.sass', '.less', '.styl',
+})
+
+
+def _format_range(start, stop):
+    """Format a hunk range the way unified diff headers expect it"""
+    length = stop - start
+    beginning = start + 1 if length else start
+    if length == 1:
+        return f"{beginning}"
+    return f"{beginning},{length}"
+
+
+def _trimmed_opcodes(a, b):
+    """Opcodes for a against b, matching only the lines between the common prefix and suffix
+
+    Edits usually touch a small region of a large file, so the matcher
+    only ever sees the changed middle instead of every line.
+    """
+    n, m = len(a), len(b)
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = n, m
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+    
+    opcodes = []
+    if lo:
+        opcodes.append(('equal', 0, lo, 0, lo))
+    if hi_a - lo > _MAX_MATCH_LINES or hi_b - lo > _MAX_MATCH_LINES:
+        # Too big to align without freezing the display, show it as one rewrite
+        opcodes.append(('replace' if hi_a > lo and hi_b > lo else 'delete' if hi_a > lo else 'insert',
+                        lo, hi_a, lo, hi_b))
+    elif lo < hi_a or lo < hi_b:
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, a[lo:hi_a], b[lo:hi_b]).get_opcodes():
+            opcodes.append((tag, i1 + lo, i2 + lo, j1 + lo, j2 + lo))
+    if hi_a < n:
+        opcodes.append(('equal', hi_a, n, hi_b, m))
+    return opcodes
+
+
+def _group_opcodes(codes, n=3):
+    """Split opcodes into hunks with up to n lines of context, as SequenceMatcher.get_grouped_opcodes"""
+    codes = list(codes) or [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    
+    nn = n + n
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # A long unchanged stretch ends one hunk and starts the next
+        if tag == 'equal' and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def unified_diff(a, b, fromfile='', tofile='', n=3):
+    """Unified diff in difflib's format, driven by the fastest available SequenceMatcher"""
+    started = False
+    for group in _group_opcodes(_trimmed_opcodes(a, b), n):
+        if not started:
+            started = True
+            yield f"--- {fromfile}\n"
+            yield f"+++ {tofile}\n"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in a[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in ('replace', 'delete'):
+                for line in a[i1:i2]:
+                    yield '-' + line
+            if tag in ('replace', 'insert'):
+                for line in b[j1:j2]:
+                    yield '+' + line
+
+
+def _small_opcodes(a, b):
+    """SequenceMatcher-style opcodes for short line lists
+
+    Common leading and trailing lines are split off first and only the
+    middle is aligned, with a plain LCS table. For the handful of lines
+    this is used on it is much cheaper than SequenceMatcher's setup.
+    """
+    n, m = len(a), len(b)
+    lo = 0
+    while lo < n and lo < m and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = n, m
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+    
+    # lcs[i][j] is the LCS length of a[lo + i:hi_a] and b[lo + j:hi_b]
+    lcs = [[0] * (hi_b - lo + 1) for _ in range(hi_a - lo + 1)]
+    for i in range(hi_a - lo - 1, -1, -1):
+        row, below = lcs[i], lcs[i + 1]
+        for j in range(hi_b - lo - 1, -1, -1):
+            if a[lo + i] == b[lo + j]:
+                row[j] = below[j + 1] + 1
+            else:
+                row[j] = max(below[j], row[j + 1])
+    
+    opcodes = []
+    if lo:
+        opcodes.append(('equal', 0, lo, 0, lo))
+    
+    i = j = lo
+    while i < hi_a or j < hi_b:
+        i0, j0 = i, j
+        while i < hi_a and j < hi_b and a[i] == b[j]:
+            i += 1
+            j += 1
+        if i > i0:
+            opcodes.append(('equal', i0, i, j0, j))
+            continue
+        
+        while (i < hi_a or j < hi_b) and not (i < hi_a and j < hi_b and a[i] == b[j]):
+            if j >= hi_b or (i < hi_a and lcs[i - lo + 1][j - lo] >= lcs[i - lo][j - lo + 1]):
+                i += 1
+            else:
+                j += 1
+        tag = 'replace' if i > i0 and j > j0 else 'delete' if i > i0 else 'insert'
+        opcodes.append((tag, i0, i, j0, j))
+    
+    if hi_a < n:
+        opcodes.append(('equal', hi_a, n, hi_b, m))
+    return opcodes
+
 
 class Handler(FileSystemEventHandler):
     def __init__(self, mon):
         self.mon = mon
+        self._root_len = len(str(mon.dir))
+        self._hidden_marker = os.sep + '.'
+    
+    def _hidden(self, path):
+        """Whether path is inside or is a dot entry below the root, which the tree never shows"""
+        return self._hidden_marker in path[self._root_len:]
+    
+    def dispatch(self, event):
+        # Opening or reading a file (grep, an indexer, our own reads) changes nothing on disk
+        if event.event_type in ('opened', 'closed_no_write'):
+            return
+        # Churn under .git and the like can't change the display, drop it on the observer thread
+        dest = getattr(event, 'dest_path', None)
+        if self._hidden(event.src_path) and (not dest or self._hidden(dest)):
+            return
+        # Hand the event to the monitor loop so all state changes happen on one thread
+        self.mon._post(super().dispatch, event)
+    
+    def on_any_event(self, event):
+        # Directory events are not tracked but still change what the tree shows
+        # A directory that went away takes every cached listing below it along
+        gone = event.is_directory and event.event_type in ('deleted', 'moved')
+        self.mon._invalidate_dir(event.src_path, descendants=gone)
+        if getattr(event, 'dest_path', None):
+            self.mon._invalidate_dir(event.dest_path)
+        self.mon._note_event()
         
     def on_created(self, event):
         if not event.is_directory:
-            self.mon.mark_changed(event.src_path, 'created')
+            self.mon._discard_pending(event.src_path)
+            # A path we still hold text for is being rewritten (e.g. vim renames the original away first)
+            event_type = 'modified' if event.src_path in self.mon.backups else 'created'
+            self.mon.mark_changed(event.src_path, event_type)
             
     def on_modified(self, event):
         if not event.is_directory:
-            self.mon.mark_changed(event.src_path, 'modified')
+            # Editors emit several modifications per save, coalesce them
+            self.mon._enqueue(event.src_path, 'modified')
             
     def on_deleted(self, event):
         if not event.is_directory:
+            self.mon._discard_pending(event.src_path)
             self.mon.mark_changed(event.src_path, 'deleted')
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.mon._discard_pending(event.src_path)
+            # Renamed to a dot name (mv a.txt .a.txt), the tree only sees it disappear
+            if self._hidden(event.dest_path):
+                self.mon.mark_changed(event.src_path, 'deleted')
+                return
+            # Atomic saves write a temp file and rename it over the target
+            replaced = event.dest_path in self.mon.backups
+            self.mon._move_content(event.src_path, event.dest_path, keep_stamp=not replaced)
+            self.mon._forget(event.src_path)
+            if replaced:
+                self.mon._enqueue(event.dest_path, 'modified')
+            else:
+                self.mon.mark_changed(event.dest_path, 'created')
+
+
+class RootWatcher(FileSystemEventHandler):
+    """Watches the monitored directory's parent for the directory itself going away"""
+    def __init__(self, mon):
+        self.mon = mon
+    
+    def on_deleted(self, event):
+        if event.src_path == str(self.mon.dir):
+            self.mon._post(self.mon._root_gone)
+    
+    def on_moved(self, event):
+        if event.src_path == str(self.mon.dir):
+            self.mon._post(self.mon._root_gone)
 
 
 class Monitor:
-    def __init__(self, directory, enable_chime=False):
+    def __init__(self, directory, enable_chime=False, debounce=_DEBOUNCE_SECONDS, persist=False,
+                 poll_interval=_POLL_INTERVAL, include_dirs=None):
         self.dir = Path(directory).resolve()
+        self.debounce = debounce
+        self.poll_interval = poll_interval  # scan period when the directory is on a network filesystem
+        self.include_dirs = list(include_dirs or ())  # subdirectories to watch, relative to the root; all when empty
+        self.persist = persist  # reuse unchanged file contents from the previous run
         self.console = Console()
-        self.changed = {}
-        self.deleted = {}
-        self.created = {}
-        self.contents = {}
-        self.backups = {}
+        # Kept oldest to newest, so expiry stops at the first live record and counters at the first stale one
+        self.changed = OrderedDict()
+        self.deleted = OrderedDict()
+        self._deleted_by_parent = {}  # parent dir -> deleted paths in it, in deletion order
+        self.created = OrderedDict()
+        # Ordered by last change so the least recently changed files are evicted first
+        self.contents = OrderedDict()
+        self.backups = OrderedDict()
+        self.content_hash = {}
+        self.backup_hash = {}
+        self._content_bytes = 0
+        self._mtime_index = {}  # path -> (st_mtime_ns, st_size) of the stored content
+        self._last_prune = time.monotonic()
         self.observer = None
         self.running = False
         self.chime = enable_chime
@@ -76,7 +671,7 @@ class Monitor:
         self.show_menu_event = threading.Event()  # Signal to show menu
         self.exit_event = threading.Event()  # Signal to exit application
         self.restart_monitor_event = threading.Event()  # Signal to restart monitoring
-        self.command_queue = queue.Queue()  # For passing commands between threads
+        self.command_queue = queue.Queue()  # Callables run in order by the monitoring thread
         
         # For keyboard navigation
         self.input_thread = None
@@ -85,6 +680,16 @@ class Monitor:
         
         self.ptk_app = None
         self.ptk_running = False
+        self._prompt_session = None  # menu prompts, created on first use
+        self._key_bindings = self._build_key_bindings()
+        
+        # Worker pool for re-reading changed files, created in start_monitoring
+        self._read_pool = None
+        
+        # Modify events waiting for the debounce window to close
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._pending_timer = None
         
         self.chime_file = None
         if enable_chime:
@@ -96,11 +701,25 @@ class Monitor:
                 if dir_chime.exists():
                     self.chime_file = dir_chime
         
+        # A single worker plays chimes, started on the first one
+        self._chime_queue = queue.Queue(maxsize=1)
+        self._chime_thread = None
+        
+        # In-process playback state, decoded lazily on the first chime
+        self._chime_lock = threading.Lock()
+        self._chime_sound = None
+        self._chime_sound_path = None
+        self._chime_device = None
+        self._chime_generation = 0
+        self._chime_backend_failed = False
+        self._chime_mci_path = None  # file currently opened under the MCI alias on Windows
+        
         # Chime batching to prevent audio spam
         self.chime_counter = 0
         self.chime_batch_size = 10  # Play chime every 10 changes
-        self.last_chime_time = datetime.now()
+        self.last_chime_time = time.monotonic()
         self.chime_cooldown = 1.0  # Minimum 1 second between chimes
+        self._chime_player = None  # Resolved on first use, "" when none is installed
         
         self.input = ""
         self.lock = threading.Lock()
@@ -108,19 +727,119 @@ class Monitor:
         self.file_idx = {}
         self.idx = 1
         
+        # Per-path result of _is_text, textness rarely changes for a given file
+        self._is_text_cache = {}
+        
+        # dir -> (st_mtime_ns, sorted children) so unchanged directories skip scandir
+        self._dir_cache = {}
+        self._dir_mtimes = {}  # prefetched for the tree walk in progress
+        # dir -> (listing, deleted overlays, child row lists, rows) from the last walk
+        self._subtree_cache = {}
+        # Sorted (name, row) pairs for the root rows in _names_source
+        self._by_name = []
+        self._names_source = None
+        
+        # Render scheduling: the Live loop only rebuilds when dirty or when a fade is due
+        self._dirty = True
+        self._next_render_at = None
+        self._terminal_size = None
+        
+        # Filesystem bursts are debounced: redraw once events have been quiet for self.debounce
+        self._burst_started_at = None
+        self._last_event_at = None
+        
+        # Set by RootWatcher when the monitored directory disappears
+        self._dir_gone = False
+        self._root_exists = True  # result of the last check_dir_exists
+        
+        # Last layout from create_display and the inputs it was built from
+        self._display = None
+        self._display_key = None
+        
+        # Previous tree and the per-row state it was built from
+        self._cached_tree = None
+        self._prev_styles = []
+        self._prev_layout = None
+        
+        # Split lines keyed by content fingerprint, shared across paths and frames
+        self._lines_cache = OrderedDict()
+        
+        # Last computed diff per path, keyed by a fingerprint of both versions,
+        # with its styled and panel renderings filled in on first use
+        self._diff_cache = OrderedDict()
+        
         self._init_contents()
         
         if not self.dir.exists():
             raise ValueError(f"Directory does not exist: {directory}")
             
+    def _play_chime_in_process(self):
+        """Play the chime through miniaudio, returns False when that isn't possible"""
+        if miniaudio is None or self._chime_backend_failed:
+            return False
+        
+        with self._chime_lock:
+            try:
+                if self._chime_sound is None or self._chime_sound_path != self.chime_file:
+                    if self._chime_device:
+                        self._chime_device.close()
+                    sound = miniaudio.decode_file(str(self.chime_file))
+                    self._chime_device = miniaudio.PlaybackDevice(
+                        nchannels=sound.nchannels, sample_rate=sound.sample_rate)
+                    self._chime_sound = sound
+                    self._chime_sound_path = self.chime_file
+                
+                sound = self._chime_sound
+                stream = miniaudio.stream_raw_pcm_memory(sound.samples, sound.nchannels, sound.sample_width)
+                next(stream)
+                self._chime_device.stop()
+                self._chime_device.start(stream)
+                self._chime_generation += 1
+                generation = self._chime_generation
+            except Exception:
+                self._chime_backend_failed = True
+                return False
+        
+        # Release the audio device once playback is over, unless a newer chime took over
+        time.sleep(sound.duration + 0.2)
+        with self._chime_lock:
+            if self._chime_generation == generation:
+                self._chime_device.stop()
+        return True
+    
+    def _play_chime_mci(self):
+        """Play the chime through winmm's MCI on Windows, returns False when that isn't possible"""
+        try:
+            import ctypes
+            mci = ctypes.windll.winmm.mciSendStringW
+        except Exception:
+            return False
+        
+        # The file stays open between chimes, so each one is a single non-blocking play command
+        path = str(self.chime_file)
+        if self._chime_mci_path != path:
+            if self._chime_mci_path is not None:
+                mci("close fsar_chime", None, 0, None)
+                self._chime_mci_path = None
+            if mci(f'open "{path}" type mpegvideo alias fsar_chime', None, 0, None) != 0:
+                return False
+            self._chime_mci_path = path
+        return mci("play fsar_chime from 0", None, 0, None) == 0
+    
     def play_chime(self):
         if not self.chime or not self.chime_file or not self.chime_file.exists():
             return
+        
+        if self._play_chime_in_process():
+            return
             
         try:
-            system = platform.system().lower()
+            system = _SYSTEM
             if system == "windows":
-                # Try PowerShell method first, then fallback to system beep
+                if self._play_chime_mci():
+                    return
+                
+                # Try PowerShell method next, then fallback to system beep
                 methods = [
                     lambda: subprocess.run([
                         "powershell", "-ExecutionPolicy", "Bypass", "-NoProfile", "-c", 
@@ -147,26 +866,40 @@ class Monitor:
                 subprocess.Popen(["afplay", str(self.chime_file)], 
                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             else:
-                players = ["mpg123", "mpv", "vlc", "mplayer", "ffplay"]
-                for player in players:
-                    try:
-                        subprocess.Popen([player, str(self.chime_file)], 
-                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                        break
-                    except FileNotFoundError:
-                        continue
+                # Search PATH once instead of failing to spawn each missing player on every chime
+                if self._chime_player is None:
+                    self._chime_player = next(filter(None, map(shutil.which, _CHIME_PLAYERS)), "")
+                if self._chime_player:
+                    subprocess.Popen([self._chime_player, str(self.chime_file)], 
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception:
             pass
     
+    def _request_chime(self):
+        """Hand a chime to the worker thread, dropped if one is already waiting"""
+        if self._chime_thread is None:
+            self._chime_thread = threading.Thread(target=self._chime_loop, daemon=True)
+            self._chime_thread.start()
+        try:
+            self._chime_queue.put_nowait(True)
+        except queue.Full:
+            pass
+    
+    def _chime_loop(self):
+        """Play queued chimes one at a time so players never overlap"""
+        while True:
+            self._chime_queue.get()
+            self.play_chime()
+    
     def _should_play_chime(self):
         """Determine if chime should play based on batching logic"""
-        now = datetime.now()
+        now = time.monotonic()
         
         # Increment counter for each change
         self.chime_counter += 1
         
         # Check if enough time has passed since last chime (cooldown)
-        time_since_last_chime = (now - self.last_chime_time).total_seconds()
+        time_since_last_chime = now - self.last_chime_time
         
         # Play chime if:
         # 1. We've reached the batch size (every 10 changes), OR
@@ -184,36 +917,123 @@ class Monitor:
         return False
             
     def mark_changed(self, path, event='modified'):
-        t = datetime.now()
+        t = time.monotonic()
         self.changed[path] = (t, event)
+        self.changed.move_to_end(path)
         
-        self.most_recent_file = Path(path).name
+        self.most_recent_file = os.path.basename(path)
         self.most_recent_time = t
         
+        self._diff_cache.pop(path, None)
+        if event != 'modified':
+            # A new or removed file at this path may not be the same kind of file
+            self._is_text_cache.pop(path, None)
+        
         if event == 'deleted':
             self.deleted[path] = t
+            self.deleted.move_to_end(path)
+            self._deleted_by_parent.setdefault(os.path.dirname(path), {})[path] = None
         elif event == 'created':
             self.created[path] = t
+            self.created.move_to_end(path)
         
         # Use batched chime logic to prevent audio spam
         if self._should_play_chime():
-            threading.Thread(target=self.play_chime, daemon=True).start()
+            self._request_chime()
+        
+        if event in ['modified', 'created']:
+            # Keep file reads off the watchdog thread so event dispatch isn't held up
+            pool = self._read_pool
+            if pool is None:
+                self._read_changed(path)
+            else:
+                try:
+                    pool.submit(self._read_changed, path)
+                except RuntimeError:
+                    # Pool was shut down by stop_monitoring while this event was in flight
+                    pass
         
-        if event in ['modified', 'created'] and Path(path).is_file():
-            self._update_content(Path(path))
+        self._note_event()
     
     def _init_contents(self):
-        try:
-            for p in self.dir.rglob('*'):
-                if p.is_file() and self._is_text(p):
-                    try:
-                        content = p.read_text(encoding='utf-8', errors='ignore')
-                        self.contents[str(p)] = content
-                        self.backups[str(p)] = content
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        files = []
+        # Each file is held twice (baseline and current), stop queuing reads once that fills the cap
+        # rather than reading everything only for _store_content to evict it again
+        budget = _MAX_CONTENT_BYTES
+        stack = [str(self.dir)]
+        while stack and budget > 0:
+            current = stack.pop()
+            try:
+                for entry in _iter_entries(current):
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and self._is_text(entry.path):
+                        st = entry.stat()
+                        if st.st_size <= _MAX_FILE_BYTES and 2 * st.st_size <= budget:
+                            files.append((entry.path, (st.st_mtime_ns, st.st_size)))
+                            budget -= 2 * st.st_size
+            except OSError:
+                continue
+        
+        # Files untouched since the last run come from the snapshot instead of disk
+        snapshot = _load_snapshot(self.dir) if self.persist else {}
+        results = {}
+        for path_str, stamp in files:
+            saved = snapshot.get(path_str)
+            if saved is not None and saved[0] == stamp:
+                results[path_str] = saved[1]
+        results.update(_bulk_read([path_str for path_str, _ in files if path_str not in results]))
+        
+        for path_str, stamp in files:
+            content = results.get(path_str)
+            if content is not None:
+                h = _fingerprint(content)
+                with self.lock:
+                    self._store_backup(path_str, content, h)
+                    self._store_content(path_str, content, h)
+                    self._mtime_index[path_str] = stamp
+    
+    def save_snapshot(self):
+        """Persist current contents of files on disk for the next run, when enabled"""
+        if not self.persist:
+            return
+        with self.lock:
+            snapshot = {path_str: (stamp, self.contents[path_str])
+                        for path_str, stamp in self._mtime_index.items()
+                        if path_str in self.contents}
+        _save_snapshot(self.dir, snapshot)
+    
+    def _enqueue(self, path, event):
+        """Queue an event so a burst for the same path becomes one mark_changed call"""
+        with self._pending_lock:
+            self._pending[path] = event
+            if self._pending_timer is None:
+                self._pending_timer = threading.Timer(self.debounce, self._post, args=(self._flush_pending,))
+                self._pending_timer.daemon = True
+                self._pending_timer.start()
+    
+    def _discard_pending(self, path):
+        """Drop a queued event, used when a create/delete supersedes it"""
+        with self._pending_lock:
+            self._pending.pop(path, None)
+    
+    def _flush_pending(self):
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+            self._pending_timer = None
+        
+        for path, event in pending.items():
+            # A modify that leaves mtime and size as last read changed nothing (an open for writing, say)
+            if event == 'modified' and path in self._mtime_index:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    pass
+                else:
+                    if self._mtime_index.get(path) == (st.st_mtime_ns, st.st_size):
+                        continue
+            self.mark_changed(path, event)
     
     def _update_content(self, path):
         if not self._is_text(path):
@@ -222,42 +1042,156 @@ class Monitor:
         try:
             path_str = str(path)
             
-            if path_str not in self.backups:
-                try:
-                    current = path.read_text(encoding='utf-8', errors='ignore')
-                    self.backups[path_str] = current
-                except Exception:
-                    self.backups[path_str] = ""
+            # Spurious events (or ones already handled) leave mtime and size untouched
+            st = os.stat(path_str)
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self._mtime_index.get(path_str) == stamp and path_str in self.contents:
+                return
+            if st.st_size > _MAX_FILE_BYTES:
+                with self.lock:
+                    self._drop_content(path_str)
+                return
             
-            new = path.read_text(encoding='utf-8', errors='ignore')
-            self.contents[path_str] = new
+            # One read serves as both the baseline (if there is none yet) and the new content
+            new = _read_or_none(path_str)
+            if new is None:
+                return
+            new_hash = _fingerprint(new)
+            with self.lock:
+                # Overlapping reads of one path can finish out of order, never store an older one last
+                current = self._mtime_index.get(path_str)
+                if current is not None and current[0] > stamp[0]:
+                    return
+                if path_str not in self.backups:
+                    self._store_backup(path_str, new, new_hash)
+                # A touch or a save of identical bytes leaves the stored text alone
+                if self.content_hash.get(path_str) != new_hash or path_str not in self.contents:
+                    self._store_content(path_str, new, new_hash)
+                    self._diff_cache.pop(path_str, None)
+                self._mtime_index[path_str] = stamp
         except Exception:
             pass
     
+    def _store_backup(self, path_str, text, h):
+        """Record the baseline content of a file, caller holds self.lock"""
+        self.backups[path_str] = text
+        self.backup_hash[path_str] = h
+        self._content_bytes += len(text)
+    
+    def _store_content(self, path_str, text, h):
+        """Record the current content of a file and evict old entries over the cap, caller holds self.lock"""
+        previous = self.contents.pop(path_str, None)
+        if previous is not None:
+            self._content_bytes -= len(previous)
+        self.contents[path_str] = text
+        self.content_hash[path_str] = h
+        self._content_bytes += len(text)
+        
+        while self._content_bytes > _MAX_CONTENT_BYTES and len(self.contents) > 1:
+            self._drop_content(next(iter(self.contents)))
+    
+    def _drop_content(self, path_str):
+        """Forget stored text for a file, caller holds self.lock"""
+        text = self.contents.pop(path_str, None)
+        if text is not None:
+            self._content_bytes -= len(text)
+        backup = self.backups.pop(path_str, None)
+        if backup is not None:
+            self._content_bytes -= len(backup)
+        self._mtime_index.pop(path_str, None)
+        self.content_hash.pop(path_str, None)
+        self.backup_hash.pop(path_str, None)
+        self._diff_cache.pop(path_str, None)
+    
+    def _move_content(self, src, dest, keep_stamp):
+        """Carry a renamed file's stored text over to its new path"""
+        with self.lock:
+            text = self.contents.get(src)
+            if text is None:
+                return
+            h = self.content_hash.get(src)
+            if dest not in self.backups:
+                self._store_backup(dest, self.backups.get(src, text), self.backup_hash.get(src, h))
+            self._store_content(dest, text, h)
+            self._diff_cache.pop(dest, None)
+            # A plain rename leaves mtime and size alone, so the text is still current at dest
+            stamp = self._mtime_index.get(src)
+            if keep_stamp and stamp is not None:
+                self._mtime_index[dest] = stamp
+    
+    def _forget(self, path):
+        """Stop tracking a path that was renamed away, without showing it as deleted
+
+        Its stored text stays (until evicted) so a file written again at the
+        same path, as editors that rename the original away do, is diffed
+        against it instead of becoming a new baseline.
+        """
+        self.changed.pop(path, None)
+        self.created.pop(path, None)
+        self._is_text_cache.pop(path, None)
+        with self.lock:
+            self._mtime_index.pop(path, None)
+            self._diff_cache.pop(path, None)
+        self._note_event()
+    
+    def _prune_events(self):
+        """Forget change records older than _EVENT_RETENTION, at most once a second"""
+        now = time.monotonic()
+        if now - self._last_prune < 1.0:
+            return
+        self._last_prune = now
+        
+        cutoff = now - _EVENT_RETENTION
+        while self.changed and next(iter(self.changed.values()))[0] < cutoff:
+            self.changed.popitem(last=False)
+        while self.created and next(iter(self.created.values())) < cutoff:
+            self.created.popitem(last=False)
+        
+        # Deleted overlays are only shown for 30s, drop them from both maps once expired
+        cutoff = now - _FADE_BOUNDARIES[-1]
+        while self.deleted and next(iter(self.deleted.values())) <= cutoff:
+            path, _ = self.deleted.popitem(last=False)
+            siblings = self._deleted_by_parent.get(os.path.dirname(path))
+            if siblings is not None:
+                siblings.pop(path, None)
+                if not siblings:
+                    self._deleted_by_parent.pop(os.path.dirname(path), None)
+    
+    def _read_changed(self, path):
+        """Refresh stored content for a changed file, runs on the read pool"""
+        if os.path.isfile(path):
+            self._update_content(path)
+            self._post(self._note_event)
+    
     def _is_text(self, path):
+        s = str(path)
+        cached = self._is_text_cache.get(s)
+        if cached is not None:
+            return cached
+        
+        result = self._probe_text(path)
+        self._is_text_cache[s] = result
+        return result
+    
+    def _probe_text(self, path):
         try:
-            exts = {'.txt', '.py', '.js', '.html', '.css', '.json', '.xml', '.md', 
-                   '.yml', '.yaml', '.ini', '.cfg', '.conf', '.log', '.sql', '.sh', 
-                   '.bat', '.ps1', '.c', '.cpp', '.h', '.java', '.cs', '.go', '.rs',
-                   '.php', '.rb', '.pl', '.r', '.swift', '.kt', '.dart', '.ts', '.jsx',
-                   '.tsx', '.vue', '.svelte', '.scss', '.sass', '.less', '.styl'}
-            
-            if path.suffix.lower() in exts:
+            suffix = os.path.splitext(os.path.basename(path))[1].lower()
+            if suffix in _TEXT_EXTS:
                 return True
             
-            if not path.suffix:
+            if not suffix:
                 try:
                     with open(path, 'rb') as f:
                         chunk = f.read(512)
-                        if b'\0' in chunk:
-                            return False
-                        try:
-                            chunk.decode('utf-8')
-                            return True
-                        except UnicodeDecodeError:
-                            return False
                 except Exception:
                     return False
+                
+                if not chunk:
+                    return True
+                if b'\0' in chunk:
+                    return False
+                # Mostly printable bytes means text, a character cut off at the probe boundary doesn't matter
+                return len(chunk.translate(None, _TEXT_CHARS)) < len(chunk) * 0.3
             
             return False
         except Exception:
@@ -265,38 +1199,121 @@ class Monitor:
     
     def get_diff(self, path):
         s = str(path)
-        if s not in self.backups or s not in self.contents:
-            return None
-        
-        old = self.backups[s]
-        new = self.contents[s]
-        
-        if old == new:
-            return None
+        # Pool workers store new content under self.lock, so take texts and hashes as one snapshot
+        with self.lock:
+            old = self.backups.get(s)
+            new = self.contents.get(s)
+            if old is None or new is None:
+                return None
+            
+            # Compare stored fingerprints instead of scanning both strings every frame
+            fingerprint = (self.backup_hash.get(s), self.content_hash.get(s))
+            if fingerprint[0] == fingerprint[1]:
+                return None
+            
+            cached = self._diff_cache.get(s)
+            if cached is not None and cached[0] == fingerprint:
+                self._diff_cache.move_to_end(s)
+                return cached[1]
         
-        old_lines = old.splitlines(keepends=True)
-        new_lines = new.splitlines(keepends=True)
+        old_lines = self._lines_for(old, fingerprint[0])
+        new_lines = self._lines_for(new, fingerprint[1])
+        name = os.path.basename(s)
         
         if len(old_lines) <= 10 and len(new_lines) <= 15:
-            diff = self._create_simple_diff(old_lines, new_lines, path.name)
+            diff = self._create_simple_diff(old_lines, new_lines, name)
         else:
-            diff = list(difflib.unified_diff(
+            diff = list(unified_diff(
                 old_lines, new_lines,
-                fromfile=f"{path.name} (before)",
-                tofile=f"{path.name} (after)",
+                fromfile=f"{name} (before)",
+                tofile=f"{name} (after)",
                 n=3
             ))
         
-        return diff if diff else None
+        diff = diff if diff else None
+        with self.lock:
+            # Content stored while diffing makes this result stale, don't cache it under the new hashes
+            if (self.backup_hash.get(s), self.content_hash.get(s)) == fingerprint:
+                self._diff_cache[s] = (fingerprint, diff, None, None)
+                if len(self._diff_cache) > _DIFF_CACHE_SIZE:
+                    self._diff_cache.popitem(last=False)
+        return diff
+    
+    def get_styled_diff(self, path):
+        """Colorized Text of get_diff, built once per distinct diff"""
+        return self._diff_rendering(path, 2, self._style_diff)
+    
+    def get_diff_text(self, path, max_lines):
+        """First max_lines of get_diff rendered as the diff panel shows them, built once per diff and limit"""
+        return self._diff_rendering(path, 3, lambda diff: self.console.render_str("".join(diff[:max_lines])),
+                                    key=max_lines)
+    
+    def _diff_rendering(self, path, slot, build, key=None):
+        """Build a rendering of the current diff, kept with key in the given slot of its cache entry"""
+        diff = self.get_diff(path)
+        if diff is None:
+            return None
+        
+        s = str(path)
+        with self.lock:
+            cached = self._diff_cache.get(s)
+        if cached is not None and cached[1] is diff and cached[slot] is not None and cached[slot][0] == key:
+            return cached[slot][1]
+        
+        rendering = build(diff)
+        with self.lock:
+            # Only attach to the entry the diff came from, a worker may have dropped or replaced it
+            cached = self._diff_cache.get(s)
+            if cached is not None and cached[1] is diff:
+                entry = list(cached)
+                entry[slot] = (key, rendering)
+                self._diff_cache[s] = tuple(entry)
+        return rendering
+    
+    def _style_diff(self, diff):
+        # One string with a span per run of same-styled lines instead of an append per line
+        parts = []
+        spans = []
+        run_style = None
+        run_start = pos = 0
+        for line in diff:
+            style = _DIFF_LINE_STYLES.get(line[:1], _DIFF_STYLE_CONTEXT)
+            if style is not _DIFF_STYLE_CONTEXT and (line.startswith('+++') or line.startswith('---')):
+                style = _DIFF_STYLE_HEADER
+            if style is not run_style:
+                if pos > run_start:
+                    spans.append(Span(run_start, pos, run_style))
+                run_style, run_start = style, pos
+            if not line.endswith('\n'):
+                line += '\n'
+            parts.append(line)
+            pos += len(line)
+        if pos > run_start:
+            spans.append(Span(run_start, pos, run_style))
+        
+        text = Text("".join(parts), spans=spans)
+        text.rstrip()
+        return text
+    
+    def _lines_for(self, content, h):
+        """Split content into lines, reusing the result for content seen before"""
+        lines = self._lines_cache.get(h)
+        if lines is not None:
+            self._lines_cache.move_to_end(h)
+            return lines
+        
+        lines = content.splitlines(keepends=True)
+        self._lines_cache[h] = lines
+        if len(self._lines_cache) > _LINES_CACHE_SIZE:
+            self._lines_cache.popitem(last=False)
+        return lines
     
     def _create_simple_diff(self, old_lines, new_lines, filename):
         diff = []
         diff.append(f"--- {filename} (before)\n")
         diff.append(f"+++ {filename} (after)\n")
         
-        matcher = SequenceMatcher(None, old_lines, new_lines)
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in _small_opcodes(old_lines, new_lines):
             if tag == 'equal':
                 for i in range(i1, i2):
                     diff.append(f"  {old_lines[i]}")
@@ -317,86 +1334,91 @@ class Monitor:
     def handle_diff_input(self, key):
         if key == 'q' or key == 'Q':
             self.diff_file = None
+            self._dirty = True
             return True
         
         try:
             num = int(key)
             if num in self.file_idx:
                 self.diff_file = self.file_idx[num]
+                self._dirty = True
                 return True
         except ValueError:
             pass
         
         return False
         
-    def is_recent(self, path, sec=5):
-        path_str = str(path)
-        if path_str in self.changed:
-            t, _ = self.changed[path_str]
-            diff = datetime.now() - t
-            return diff.total_seconds() < sec
+    def is_recent(self, path, sec=5, now=None):
+        entry = self.changed.get(str(path))
+        if entry is not None:
+            if now is None:
+                now = time.monotonic()
+            return now - entry[0] < sec
         return False
         
     def get_event(self, path):
-        path_str = str(path)
-        if path_str in self.changed:
-            _, event = self.changed[path_str]
-            return event
-        return None
-        
-    def is_deleted(self, path, sec=30):
-        path_str = str(path)
-        if path_str in self.deleted:
-            diff = datetime.now() - self.deleted[path_str]
-            return diff.total_seconds() < sec
+        entry = self.changed.get(str(path))
+        return entry[1] if entry is not None else None
+        
+    def is_deleted(self, path, sec=30, now=None):
+        t = self.deleted.get(str(path))
+        if t is not None:
+            if now is None:
+                now = time.monotonic()
+            return now - t < sec
         return False
         
-    def is_created(self, path, sec=10):
+    def is_created(self, path, sec=10, now=None):
         path_str = str(path)
-        if path_str in self.changed:
-            t, event = self.changed[path_str]
-            if event == 'created':
-                diff = datetime.now() - t
-                return diff.total_seconds() < sec
-        if path_str in self.created:
-            diff = datetime.now() - self.created[path_str]
-            return diff.total_seconds() < sec
+        if now is None:
+            now = time.monotonic()
+        entry = self.changed.get(path_str)
+        if entry is not None and entry[1] == 'created':
+            return now - entry[0] < sec
+        t = self.created.get(path_str)
+        if t is not None:
+            return now - t < sec
         return False
         
-    def get_color_style(self, path):
-        event = self.get_event(path)
-        
-        if self.is_deleted(path):
+    def get_color_style(self, path, now=None):
+        if now is None:
+            now = time.monotonic()
+        path_str = str(path)
+        return self._color_style(path_str, self.changed.get(path_str), now)
+    
+    def _color_style(self, path_str, entry, now):
+        """Color and style for a path whose changed entry the caller already looked up"""
+        t = self.deleted.get(path_str)
+        if t is not None and now - t < 30:
             return "dim red", "strike"
         
-        if event == 'created':
-            if self.is_recent(path, 2):
-                return "bright_green", None
-            elif self.is_recent(path, 5):
-                return "green", None
-            elif self.is_recent(path, 10):
-                return "dark_green", None
-        elif event == 'modified':
-            if self.is_recent(path, 2):
-                return "bright_red", None
-            elif self.is_recent(path, 5):
-                return "red", None
-            elif self.is_recent(path, 10):
-                return "yellow", None
-            elif self.is_recent(path, 30):
-                return "orange3", None
+        if entry is not None:
+            colors = _EVENT_BUCKET_COLORS.get(entry[1])
+            if colors is not None:
+                color = colors[bisect_right(_FADE_BOUNDARIES, now - entry[0])]
+                if color is not None:
+                    return color, None
         
         return "white", None
             
-    def build_tree(self):
-        if not self.dir.exists():
+    def build_tree(self, now=None):
+        if not self.check_dir_exists():
             tree = Tree(f"❌ [bold red]Directory not found: {self.dir}[/bold red]")
             tree.add("[dim red]The monitored directory has been deleted or moved[/dim red]")
             tree.add("[dim yellow]Press Ctrl+C to change to a different directory[/dim yellow]")
+            self._cached_tree = None
             return tree
             
+        # Check every cached directory's mtime up front in one batch
+        self._dir_mtimes = _stat_mtimes(list(self._dir_cache))
+        # Directories whose stat failed are gone (their events may have been missed), stop checking them
+        for dir_str, mtime in self._dir_mtimes.items():
+            if mtime is None:
+                self._dir_cache.pop(dir_str, None)
+                self._subtree_cache.pop(dir_str, None)
         tree_items = []
         self._collect_tree_items(self.dir, tree_items)
+        self._dir_mtimes = {}
         self.tree_height = len(tree_items)
         
         visible_count = self._calculate_visible_lines()
@@ -404,6 +1426,24 @@ class Monitor:
         visible_items = tree_items[self.scroll_offset:self.scroll_offset + visible_count]
         
         end_line = min(self.scroll_offset + visible_count, self.tree_height)
+        
+        # Reuse the previous Tree when no visible row changed its appearance
+        if now is None:
+            now = time.monotonic()
+        dirty = len(visible_items) != len(self._prev_styles)
+        for i, item_info in enumerate(visible_items):
+            item_info['state'] = self._item_state(item_info, now)
+            item_info['dirty'] = dirty or self._prev_styles[i] != item_info['state']
+            dirty = dirty or item_info['dirty']
+        
+        layout_key = (self.dir, self.scroll_offset, end_line, self.tree_height,
+                      tuple((info['path'], info['depth']) for info in visible_items))
+        if not dirty and layout_key == self._prev_layout and self._cached_tree is not None:
+            return self._cached_tree
+        
+        self._prev_styles = [info['state'] for info in visible_items]
+        self._prev_layout = layout_key
+        
         tree = Tree(f"📁 [bold blue]{self.dir.name}[/bold blue] (line {self.scroll_offset + 1}-{end_line} of {self.tree_height})")
         self.file_idx = {}
         self.idx = 1
@@ -414,6 +1454,7 @@ class Monitor:
         if self.scroll_offset + visible_count >= self.tree_height and self.tree_height > 0:
             tree.add("[dim cyan]📁 End of directory tree[/dim cyan]")
         
+        self._cached_tree = tree
         return tree
     
     def _calculate_visible_lines(self):
@@ -436,188 +1477,218 @@ class Monitor:
             return 30
     
     def _collect_tree_items(self, directory, items, depth=0, max_depth=10):
-        if depth >= max_depth or not directory.exists():
-            return
+        items.extend(self._subtree_items(str(directory), depth, max_depth))
+    
+    def _subtree_items(self, dir_str, depth, max_depth):
+        """Flattened rows for a directory, shared with the last walk when nothing below changed"""
+        if depth >= max_depth:
+            return []
             
         try:
-            dir_items = sorted(directory.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
+            children = self._list_dir(dir_str)
+            # Huge directories show their first entries (folders sort first) and a count of the rest
+            shown = children[:_MAX_DIR_ENTRIES] if len(children) > _MAX_DIR_ENTRIES else children
+            # Children come first so an unchanged subtree hands back the very same list
+            subtrees = [self._subtree_items(entry.path, depth + 1, max_depth) if is_dir else None
+                        for entry, is_dir in shown]
+            overlays = []
+            for deleted_path in list(self._deleted_by_parent.get(dir_str, ())):
+                name = os.path.basename(deleted_path)
+                if not name.startswith('.') and self.is_deleted(deleted_path):
+                    overlays.append(deleted_path)
             
-            for deleted_path in list(self.deleted.keys()):
-                deleted_file = Path(deleted_path)
-                if deleted_file.parent == directory and self.is_deleted(deleted_file):
-                    dir_items.append(deleted_file)
+            cached = self._subtree_cache.get(dir_str)
+            if (cached is not None and cached[0] is children and cached[1] == overlays
+                    and all(a is b for a, b in zip(cached[2], subtrees))):
+                return cached[3]
             
-            for item in dir_items:
-                if item.name.startswith('.'):
-                    continue
-                
-                item_info = {
-                    'path': item,
+            items = []
+            for (entry, is_dir), subtree in zip(shown, subtrees):
+                items.append({
+                    'entry': entry,
+                    'path': entry.path,
+                    'name': entry.name,
                     'depth': depth,
-                    'is_dir': item.is_dir() and item.exists()
-                }
-                items.append(item_info)
-                
-                if item.is_dir() and item.exists():
-                    self._collect_tree_items(item, items, depth + 1, max_depth)
+                    'is_dir': is_dir
+                })
+                if subtree:
+                    items.extend(subtree)
+            if shown is not children:
+                items.append(self._error_item(dir_str, depth, f"… {len(children) - len(shown)} more entries",
+                                              style="dim"))
+            
+            for deleted_path in overlays:
+                items.append({
+                    'entry': None,
+                    'path': deleted_path,
+                    'name': os.path.basename(deleted_path),
+                    'depth': depth,
+                    'is_dir': False
+                })
+            
+            self._subtree_cache[dir_str] = (children, overlays, subtrees, items)
+            return items
                     
-        except (PermissionError, FileNotFoundError, OSError):
-            pass
+        except PermissionError:
+            return [self._error_item(dir_str, depth, "Permission Denied")]
+        except FileNotFoundError:
+            return [self._error_item(dir_str, depth, "Directory not found")]
+        except OSError as e:
+            return [self._error_item(dir_str, depth, f"Error accessing directory: {e}")]
     
-    def _add_tree_item(self, tree_node, item_info):
+    def _list_dir(self, dir_str):
+        """Sorted visible children of a directory, rescanned only when its mtime moves"""
+        mtime = self._dir_mtimes.get(dir_str)
+        if mtime is None:
+            try:
+                mtime = os.stat(dir_str).st_mtime_ns
+            except OSError:
+                # Gone or unreadable, don't keep its listing around
+                self._dir_cache.pop(dir_str, None)
+                self._subtree_cache.pop(dir_str, None)
+                raise
+        cached = self._dir_cache.get(dir_str)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        # Decorate once so the sort compares plain tuples instead of calling back into Python
+        keyed = [(e.is_file(), e.name.lower(), e) for e in _iter_entries(dir_str)
+                 if not e.name.startswith('.')]
+        keyed.sort(key=itemgetter(0, 1))
+        children = [(entry, entry.is_dir()) for _, _, entry in keyed]
+        
+        self._dir_cache[dir_str] = (mtime, children)
+        return children
+    
+    def _invalidate_dir(self, path, descendants=False):
+        """Drop the cached listing holding path, its DirEntry stats are stale"""
+        self._dir_cache.pop(path, None)
+        self._dir_cache.pop(os.path.dirname(path), None)
+        self._subtree_cache.pop(path, None)
+        if descendants:
+            prefix = path + os.sep
+            for cache in (self._dir_cache, self._subtree_cache):
+                for key in [key for key in cache if key.startswith(prefix)]:
+                    del cache[key]
+    
+    def _error_item(self, dir_str, depth, message, style="dim red"):
+        """Placeholder row shown inside a directory that couldn't be listed or was cut short"""
+        return {
+            'entry': None,
+            'path': dir_str,
+            'name': "",
+            'depth': depth,
+            'is_dir': False,
+            'error': message,
+            'style': style
+        }
+    
+    def _item_state(self, item_info, now):
+        """Everything that affects how a tree row looks, used to detect unchanged rows"""
+        if 'error' in item_info:
+            return ('error', item_info['error'])
+        
+        # Plain path strings all the way down, no Path objects per row
         item = item_info['path']
+        # One lookup of the change record serves the color, the age and the event tag
+        record = self.changed.get(item)
+        color, style = self._color_style(item, record, now)
+        
+        if item_info['is_dir']:
+            return (color, style, None, self.is_created(item, now=now), None, False)
+        
+        # Scanned entries exist by construction; deleted overlays have no entry.
+        # DirEntry.stat() is cached, so the whole render pass stats a file at most once.
+        size = None
+        entry = item_info['entry']
+        if entry is not None:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                size = None
+        
+        has_diff = self._is_text(item) and self.get_diff(item) is not None
+        return (color, style, record[1] if record is not None else None, False, size, has_diff)
+    
+    def _add_tree_item(self, tree_node, item_info):
+        if 'error' in item_info:
+            text = Text("  " * item_info['depth'])
+            text.append(item_info['error'], style=item_info['style'])
+            tree_node.add(text)
+            return
+        
         depth = item_info['depth']
         is_dir = item_info['is_dir']
+        color, style, event, created, size, has_diff = item_info['state']
+        
+        idx = None
+        if has_diff:
+            idx = self.idx
+            self.file_idx[idx] = item_info['path']
+            self.idx += 1
+        
+        # Rows persist across walks while their directory is unchanged, so the
+        # Text built last time is reused until the row's appearance changes
+        key = (item_info['state'], idx)
+        rendered = item_info.get('rendered')
+        if rendered is not None and rendered[0] == key:
+            tree_node.add(rendered[1])
+            return
         
-        # Create indentation for nested items
-        indent = "  " * depth
+        name_style = f"{color} {style}" if style else color
         
-        color, style = self.get_color_style(item)
+        # Build a Text directly so rich doesn't have to parse markup for every row
+        text = Text("  " * depth)
         
         if is_dir:
-            icon = "📁"
-            new_tag = " [bold green][NEW][/bold green]" if self.is_created(item) else ""
-            
-            if style:
-                text = f"{indent}{icon} [{color} {style}]{item.name}/[/{style} {color}]{new_tag}"
-            else:
-                text = f"{indent}{icon} [{color}]{item.name}/[/{color}]{new_tag}"
-            
-            tree_node.add(text)
+            text.append("📁 ")
+            text.append(item_info['name'] + "/", style=name_style)
+            if created:
+                text.append(" ")
+                text.append("[NEW]", style="bold green")
         else:
-            event = self.get_event(item)
-            
-            if event == 'created':
-                icon = "📄"
-            elif event == 'deleted':
-                icon = "🗑️ "
-            else:
-                icon = "📄"
-            
-            size_str = ""
-            if item.exists():
-                try:
-                    size = item.stat().st_size
-                    if size < 1024:
-                        size_str = f" [dim]({size}B)[/dim]"
-                    elif size < 1024 * 1024:
-                        size_str = f" [dim]({size/1024:.1f}KB)[/dim]"
-                    else:
-                        size_str = f" [dim]({size/(1024*1024):.1f}MB)[/dim]"
-                except:
-                    size_str = ""
+            if idx is not None:
+                text.append(f"[[{idx}]]", style="bold cyan")
+                text.append(" ")
             
-            diff_button = ""
-            if self._is_text(item) and self.get_diff(item) is not None:
-                self.file_idx[self.idx] = str(item)
-                diff_button = f"[bold cyan][[{self.idx}]][/bold cyan] "
-                self.idx += 1
+            text.append("🗑️  " if event == 'deleted' else "📄 ")
+            text.append(item_info['name'], style=name_style)
             
-            new_tag = " [bold green][NEW][/bold green]" if event == 'created' else ""
-            edited_tag = " [bold yellow][EDITED][/bold yellow]" if (event == 'modified' and event != 'created') else ""
+            if event == 'created':
+                text.append(" ")
+                text.append("[NEW]", style="bold green")
+            elif event == 'modified':
+                text.append(" ")
+                text.append("[EDITED]", style="bold yellow")
             
-            if style:
-                node_text = f"{indent}{diff_button}{icon} [{color} {style}]{item.name}[/{style} {color}]{new_tag}{edited_tag}{size_str}"
-            else:
-                node_text = f"{indent}{diff_button}{icon} [{color}]{item.name}[/{color}]{new_tag}{edited_tag}{size_str}"
-                
-            tree_node.add(node_text)
+            if size is not None:
+                text.append(" ")
+                text.append(_format_size(size), style="dim")
+        
+        item_info['rendered'] = (key, text)
+        tree_node.add(text)
         
-    def _add_dir(self, tree_node, directory, max_depth=10, depth=0):
-        if depth >= max_depth:
-            return
-            
-        if not directory.exists():
-            tree_node.add("[dim red]Directory deleted or moved[/dim red]")
-            return
-            
-        try:
-            items = sorted(directory.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
-            
-            for deleted_path in list(self.deleted.keys()):
-                deleted_file = Path(deleted_path)
-                if deleted_file.parent == directory and self.is_deleted(deleted_file):
-                    items.append(deleted_file)
-            
-            for item in items:
-                if item.name.startswith('.'):
-                    continue
-                    
-                color, style = self.get_color_style(item)
-                
-                if item.is_dir() and item.exists():
-                    icon = "📁"
-                    new_tag = " [bold green][NEW][/bold green]" if self.is_created(item) else ""
-                    
-                    if style:
-                        text = f"{icon} [{color} {style}]{item.name}[/{style} {color}]{new_tag}"
-                    else:
-                        text = f"{icon} [{color}]{item.name}[/{color}]{new_tag}"
-                    branch = tree_node.add(text)
-                    
-                    self._add_dir(branch, item, max_depth, depth + 1)
-                else:
-                    event = self.get_event(item)
-                    
-                    if event == 'created':
-                        icon = "📄"
-                    elif event == 'deleted':
-                        icon = "🗑️ "
-                    else:
-                        icon = "📄"
-                    
-                    # Show file size for existing files
-                    size_str = ""
-                    if item.exists():
-                        try:
-                            size = item.stat().st_size
-                            if size < 1024:
-                                size_str = f" [dim]({size}B)[/dim]"
-                            elif size < 1024 * 1024:
-                                size_str = f" [dim]({size/1024:.1f}KB)[/dim]"
-                            else:
-                                size_str = f" [dim]({size/(1024*1024):.1f}MB)[/dim]"
-                        except:
-                            size_str = ""
-                    
-                    # Check if diff is available for this file
-                    diff_button = ""
-                    if self._is_text(item) and self.get_diff(item) is not None:
-                        self.file_idx[self.idx] = str(item)
-                        diff_button = f"[bold cyan][[{self.idx}]][/bold cyan] "
-                        self.idx += 1
-                    
-                    # Add tags after the filename
-                    new_tag = " [bold green][NEW][/bold green]" if event == 'created' else ""
-                    edited_tag = " [bold yellow][EDITED][/bold yellow]" if (event == 'modified' and event != 'created') else ""
-                    
-                    # Apply styling
-                    if style:
-                        node_text = f"{diff_button}{icon} [{color} {style}]{item.name}[/{style} {color}]{new_tag}{edited_tag}{size_str}"
-                    else:
-                        node_text = f"{diff_button}{icon} [{color}]{item.name}[/{color}]{new_tag}{edited_tag}{size_str}"
-                        
-                    tree_node.add(node_text)
-                    
-        except PermissionError:
-            tree_node.add("[dim red]Permission Denied[/dim red]")
-        except FileNotFoundError:
-            tree_node.add("[dim red]Directory not found[/dim red]")
-        except OSError as e:
-            tree_node.add(f"[dim red]Error accessing directory: {e}[/dim red]")
-            
     def create_display(self):
-        tree = self.build_tree()
+        # One clock read per frame, shared by the tree and the status panel
+        now = time.monotonic()
+        tree = self.build_tree(now)
         
-        dir_exists = self.check_dir_exists()
+        # build_tree just checked, don't stat the root a second time per frame
+        dir_exists = self._root_exists
         
-        now = datetime.now()
-        recent_created = sum(1 for t, event in self.changed.values() 
-                            if event == 'created' and (now - t).total_seconds() < 30)
-        recent_modified = sum(1 for t, event in self.changed.values() 
-                             if event == 'modified' and (now - t).total_seconds() < 30)
-        recent_deleted = sum(1 for t in self.deleted.values() 
-                            if (now - t).total_seconds() < 30)
+        # Newest first, stopping at the first record that is too old to count
+        recent_created = recent_modified = recent_deleted = 0
+        for t, event in reversed(self.changed.values()):
+            if now - t >= 30:
+                break
+            if event == 'created':
+                recent_created += 1
+            elif event == 'modified':
+                recent_modified += 1
+        for t in reversed(self.deleted.values()):
+            if now - t >= 30:
+                break
+            recent_deleted += 1
         
         chime_status = "[green]ON[/green]" if self.chime else "[red]OFF[/red]"
         
@@ -650,8 +1721,8 @@ class Monitor:
         
         if self.most_recent_file:
             time_ago = ""
-            if self.most_recent_time:
-                seconds_ago = (datetime.now() - self.most_recent_time).total_seconds()
+            if self.most_recent_time is not None:
+                seconds_ago = now - self.most_recent_time
                 if seconds_ago < 60:
                     time_ago = f" ({int(seconds_ago)}s ago)"
                 elif seconds_ago < 3600:
@@ -666,17 +1737,23 @@ class Monitor:
         
         instructions_text = "".join(instructions)
         
-        from rich.layout import Layout
+        diff = self.get_diff(self.diff_file) if self.diff_file else None
+        
+        # Same tree and same text as last frame, hand Live the layout it already has
+        display_key = (tree, info_text, instructions_text, self.diff_file, diff, self.console.height)
+        if self._display is not None and display_key == self._display_key:
+            return self._display
+        
         layout = Layout()
         
         instruction_lines = instructions_text.count('\n') + 1
         instruction_panel_size = max(3, min(6, instruction_lines + 2))
         
         if self.diff_file:
-            diff = self.get_diff(Path(self.diff_file))
             if diff:
-                diff_content = "".join(diff)
-                diff_panel = Panel(diff_content, title=f"[bold yellow]Diff for {Path(self.diff_file).name}[/bold yellow]", 
+                # Each line takes at least one row, so nothing past the terminal height can be visible
+                diff_text = self.get_diff_text(self.diff_file, self.console.height)
+                diff_panel = Panel(diff_text, title=f"[bold yellow]Diff for {os.path.basename(self.diff_file)}[/bold yellow]", 
                                  border_style="yellow")
                 layout.split_column(
                     Layout(info_panel, size=6 if not dir_exists else 5),
@@ -697,6 +1774,8 @@ class Monitor:
                 Layout(Panel(instructions_text, border_style="dim"), size=instruction_panel_size)
             )
         
+        self._display = layout
+        self._display_key = display_key
         return layout
         
     def change_path(self, new_path):
@@ -707,14 +1786,32 @@ class Monitor:
         
         # Stop current monitoring
         self.stop_monitoring()
+        self.save_snapshot()
         
         with self.state_lock:
             # Clear all tracking data
             self.changed.clear()
             self.created.clear()
             self.deleted.clear()
+            self._deleted_by_parent.clear()
             self.contents.clear()
             self.backups.clear()
+            self.content_hash.clear()
+            self.backup_hash.clear()
+            self._content_bytes = 0
+            self._mtime_index.clear()
+            self._diff_cache.clear()
+            self._is_text_cache.clear()
+            self._dir_cache.clear()
+            self._subtree_cache.clear()
+            
+            # Events queued for the old directory no longer apply
+            try:
+                while True:
+                    self.command_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._burst_started_at = self._last_event_at = None
             
             # Reset view state
             self.scroll_offset = 0
@@ -736,6 +1833,18 @@ class Monitor:
         # Initialize content tracking for new directory
         self._init_contents()
         
+    def _watched_dirs(self):
+        """Directories to schedule recursive watches on, the root unless include_dirs names some inside it"""
+        watched = []
+        for name in self.include_dirs:
+            path = (self.dir / name).resolve()
+            # Ignore entries that don't exist under this root, e.g. after changing path
+            if path.is_dir() and (path == self.dir or self.dir in path.parents):
+                watched.append(path)
+        # Watches are recursive, a directory inside another included one would see each event twice
+        watched = {path for path in watched if not any(other in path.parents for other in watched)}
+        return sorted(map(str, watched)) or [str(self.dir)]
+    
     def start_monitoring(self):
         """Start the file system monitoring"""
         if not self.dir.exists():
@@ -747,10 +1856,24 @@ class Monitor:
         with self.state_lock:
             self.running = True
         
-        # Set up the watchdog observer
-        self.observer = Observer()
+        self._read_pool = ThreadPoolExecutor(max_workers=4)
+        
+        # Set up the watchdog observer, polling on network mounts where native events miss remote writes
+        if _fs_type(str(self.dir)) in _NETWORK_FS:
+            self.observer = PollingObserver(timeout=self.poll_interval)
+        else:
+            self.observer = Observer()
         event_handler = Handler(self)
-        self.observer.schedule(event_handler, str(self.dir), recursive=True)
+        for watched in self._watched_dirs():
+            self.observer.schedule(event_handler, watched, recursive=True)
+        
+        # Learn about the root being deleted or moved from its parent instead of polling
+        self._dir_gone = False
+        if self.dir.parent != self.dir:
+            try:
+                self.observer.schedule(RootWatcher(self), str(self.dir.parent), recursive=False)
+            except Exception:
+                pass
         self.observer.start()
         
         # Clean up any existing input thread
@@ -769,7 +1892,8 @@ class Monitor:
     
     def check_dir_exists(self):
         """Check if the monitored directory exists"""
-        return self.dir.exists()
+        self._root_exists = os.path.isdir(self.dir)
+        return self._root_exists
         
     def _kill_prompt_toolkit(self):
         """Forcibly terminate prompt_toolkit application"""
@@ -795,26 +1919,43 @@ class Monitor:
             except Exception:
                 pass
         
+        with self._pending_lock:
+            if self._pending_timer:
+                self._pending_timer.cancel()
+                self._pending_timer = None
+            self._pending.clear()
+        
+        if self._read_pool:
+            self._read_pool.shutdown(wait=False)
+            self._read_pool = None
+        
         # Kill prompt_toolkit
         self._kill_prompt_toolkit()
         
     def _monitoring_thread(self):
         """Thread function for monitoring files and displaying updates"""
         try:
-            with Live(self.create_display(), refresh_per_second=2, screen=True) as live:
-                counter = 0
+            with Live(self.create_display(), auto_refresh=False, screen=True) as live:
+                self._dirty = True
                 while self.running and not self.show_menu_event.is_set() and not self.exit_event.is_set():
-                    with self.state_lock:
-                        live.update(self.create_display())
+                    self._prune_events()
+                    
+                    # Only rebuild when something changed or a highlight is due to fade
+                    if self._needs_render():
+                        with self.state_lock:
+                            self._dirty = False
+                            self._burst_started_at = self._last_event_at = None
+                            live.update(self.create_display(), refresh=True)
+                            self._schedule_next_render()
                     
-                    counter += 1
-                    if counter >= 10:
-                        counter = 0
+                    if self._dir_gone:
+                        self._dir_gone = False
                         if not self.check_dir_exists():
                             self.stop_monitoring()
                             self.show_menu_event.set()
                     
-                    time.sleep(0.5)
+                    # Input and filesystem events arrive here, everything else waits for the next check
+                    self._run_commands(self._wait_timeout())
                     
                     # Check if menu key was pressed
                     if self.show_menu_event.is_set():
@@ -827,6 +1968,110 @@ class Monitor:
             self._kill_prompt_toolkit()
             os.system('cls' if os.name == 'nt' else 'clear')
     
+    def _note_event(self):
+        """Record filesystem activity, the redraw waits for the burst to go quiet"""
+        now = time.monotonic()
+        if self._burst_started_at is None:
+            self._burst_started_at = now
+        self._last_event_at = now
+    
+    def _root_gone(self):
+        """The monitored directory was deleted or moved, checked on the next loop pass"""
+        self._dir_gone = True
+        self._dirty = True
+    
+    def _redraw(self):
+        """Rebuild the display on the next loop pass"""
+        self._dirty = True
+    
+    def _post(self, fn, *args):
+        """Queue a call for the monitoring thread, waking it if it is idle"""
+        self.command_queue.put((fn, args))
+    
+    def _run_commands(self, timeout):
+        """Wait up to timeout for queued calls, then run everything that is queued"""
+        try:
+            command = self.command_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        
+        while True:
+            fn, args = command
+            try:
+                fn(*args)
+            except Exception:
+                pass
+            try:
+                command = self.command_queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _burst_due_at(self):
+        """When the pending filesystem burst should be drawn, or None if there is none"""
+        last, started = self._last_event_at, self._burst_started_at
+        if last is None or started is None:
+            return None
+        return min(last + self.debounce, started + _MAX_RENDER_DELAY)
+    
+    def _wait_timeout(self):
+        """How long the Live loop may sleep before something needs checking"""
+        now = time.monotonic()
+        timeout = _IDLE_WAKEUP
+        for due in (self._burst_due_at(), self._next_render_at):
+            if due is not None:
+                timeout = min(timeout, due - now)
+        return max(0.0, timeout)
+    
+    def _needs_render(self):
+        """Check whether the display is stale and has to be rebuilt"""
+        if self._dirty:
+            return True
+        
+        due = self._burst_due_at()
+        if due is not None and time.monotonic() >= due:
+            return True
+        
+        if self._next_render_at is not None and time.monotonic() >= self._next_render_at:
+            return True
+        
+        try:
+            size = os.get_terminal_size()
+        except OSError:
+            size = None
+        if size != self._terminal_size:
+            self._terminal_size = size
+            return True
+        
+        return False
+    
+    def _schedule_next_render(self):
+        """Work out when the next highlight fade or 'ago' label change is due"""
+        now = time.monotonic()
+        delays = []
+        
+        # Records past the last boundary never fade again, and the maps are in time order
+        for t, _ in reversed(self.changed.values()):
+            age = now - t
+            if age >= _FADE_BOUNDARIES[-1]:
+                break
+            for boundary in _FADE_BOUNDARIES:
+                if age < boundary:
+                    delays.append(boundary - age)
+                    break
+        
+        for t in reversed(self.deleted.values()):
+            age = now - t
+            if age >= _FADE_BOUNDARIES[-1]:
+                break
+            delays.append(_FADE_BOUNDARIES[-1] - age)
+        
+        if self.most_recent_time is not None:
+            age = now - self.most_recent_time
+            unit = 1 if age < 60 else 60 if age < 3600 else 3600
+            delays.append(unit - age % unit)
+        
+        self._next_render_at = now + min(delays) if delays else None
+    
     def _menu_thread(self):
         """Thread function for handling menu interactions"""
         while not self.exit_event.is_set():
@@ -876,7 +2121,7 @@ class Monitor:
         time.sleep(0.2)
         
         # Force terminal to normal mode on Unix-like platforms
-        if platform.system() != "Windows":
+        if _SYSTEM != "windows":
             try:
                 # Reset terminal modes
                 os.system("stty sane")
@@ -889,6 +2134,19 @@ class Monitor:
         # Print a separator to ensure terminal is in a known good state
         print("\n" + "-" * 60 + "\n")
     
+    def _ask(self, message):
+        """Read a line for the menu through prompt_toolkit, falling back to input()"""
+        if sys.stdin.isatty():
+            try:
+                if self._prompt_session is None:
+                    self._prompt_session = PromptSession()
+                return self._prompt_session.prompt(message)
+            except (KeyboardInterrupt, EOFError):
+                raise
+            except Exception:
+                pass
+        return input(message)
+    
     def _handle_menu(self):
         """Handles the menu display and interaction"""
         while not self.exit_event.is_set():
@@ -902,17 +2160,15 @@ class Monitor:
                 dir_exists = self.check_dir_exists()
                 
                 if not dir_exists:
-                    self.console.print("\n[red]⚠️ DIRECTORY DELETED OR MOVED![/red]")
+                    self.console.print(_DIR_GONE_HEADER)
                     self.console.print(f"[dim]The monitored directory no longer exists: {self.dir}[/dim]")
-                    self.console.print("\n[yellow]🔧 Recovery Options:[/yellow]")
-                    self.console.print("  [cyan]1.[/cyan] Change to a different directory")
-                    self.console.print("  [cyan]2.[/cyan] Exit program")
+                    self.console.print(_RECOVERY_MENU)
                     
-                    choice = input("\nEnter choice (1-2): ").strip()
+                    choice = self._ask("\nEnter choice (1-2): ").strip()
                     
                     if choice == '1':
                         self._ensure_input_ready()
-                        new_path = input("Enter new directory path: ").strip()
+                        new_path = self._ask("Enter new directory path: ").strip()
                         if new_path:
                             try:
                                 self.change_path(new_path)
@@ -933,20 +2189,12 @@ class Monitor:
                         self.console.print("[red]Invalid choice. Please enter 1 or 2.[/red]")
                 else:
                     # Print with higher visibility
-                    print("\n" + "=" * 60)
-                    self.console.print("\n[bold yellow]🔧 FSAR MONITOR CONTROLS:[/bold yellow]")
-                    print("-" * 60 + "\n")
-                    self.console.print("  [bold cyan]1.[/bold cyan] Change directory path")
-                    self.console.print("  [bold cyan]2.[/bold cyan] Toggle chime notifications")
-                    self.console.print("  [bold cyan]3.[/bold cyan] View file diffs")
-                    self.console.print("  [bold cyan]4.[/bold cyan] Resume monitoring")
-                    self.console.print("  [bold cyan]5.[/bold cyan] Exit")
-                    print("\n" + "=" * 60)
+                    self.console.print(_MAIN_MENU)
                     
-                    choice = input("\nEnter choice (1-5): ").strip()
+                    choice = self._ask("\nEnter choice (1-5): ").strip()
                     
                     if choice == '1':
-                        new_path = input("Enter new directory path: ").strip()
+                        new_path = self._ask("Enter new directory path: ").strip()
                         if new_path:
                             try:
                                 self.change_path(new_path)
@@ -987,8 +2235,10 @@ class Monitor:
                     else:
                         self.console.print("[red]Invalid choice. Please enter 1-5.[/red]")
             
-            except KeyboardInterrupt:
-                continue
+            except (KeyboardInterrupt, EOFError):
+                # prompt_toolkit turns Ctrl+C/Ctrl+D into exceptions on this thread, they mean quit
+                self.exit_event.set()
+                return
         
     def run(self):
         """Main entry point to start the application"""
@@ -1004,6 +2254,10 @@ class Monitor:
         # Start file monitoring
         self.start_monitoring()
         
+        # Redraw as soon as the terminal is resized instead of polling its size
+        if hasattr(signal, 'SIGWINCH'):
+            signal.signal(signal.SIGWINCH, lambda signum, frame: self._post(self._redraw))
+        
         # Start the menu thread (runs in background waiting for signals)
         self.menu_thread = threading.Thread(target=self._menu_thread, daemon=True)
         self.menu_thread.start()
@@ -1012,10 +2266,11 @@ class Monitor:
         self.monitor_thread = threading.Thread(target=self._monitoring_thread, daemon=True)
         self.monitor_thread.start()
         
-        # Wait for application to exit
+        # Wait for application to exit, lock waits wake for signals on POSIX but Windows needs a timeout for Ctrl+C
         try:
-            while not self.exit_event.is_set():
-                time.sleep(0.5)
+            timeout = 0.5 if _SYSTEM == "windows" else None
+            while not self.exit_event.wait(timeout):
+                pass
                 
         except KeyboardInterrupt:
             # Alternative way to exit
@@ -1024,6 +2279,7 @@ class Monitor:
         finally:
             # Clean up on exit
             self.stop_monitoring()
+            self.save_snapshot()
             self._kill_prompt_toolkit()
             self.console.print("\n[yellow]Monitoring stopped.[/yellow]")
 
@@ -1048,7 +2304,7 @@ class Monitor:
             self.console.print(f"  [cyan]{num}.[/cyan] {name}")
         
         self.console.print("\n[dim]Enter a number to view diff, or 'q' to go back[/dim]")
-        choice = input("Choice: ").strip()
+        choice = self._ask("Choice: ").strip()
         
         if choice.lower() == 'q':
             return
@@ -1057,25 +2313,15 @@ class Monitor:
             num = int(choice)
             if num in self.file_idx:
                 path = Path(self.file_idx[num])
-                diff = self.get_diff(path)
+                # Styled once and cached, so viewing the same diff again is a single print
+                diff = self.get_styled_diff(path)
                 
                 if diff:
                     self.console.print(f"\n[bold yellow]📋 Diff for {path.name}:[/bold yellow]")
                     self.console.print("-" * 60)
-                    for line in diff:
-                        line = line.rstrip('\n')
-                        if line.startswith('+++') or line.startswith('---'):
-                            self.console.print(f"[bold blue]{line}[/bold blue]")
-                        elif line.startswith('@@'):
-                            self.console.print(f"[bold cyan]{line}[/bold cyan]")
-                        elif line.startswith('+'):
-                            self.console.print(f"[green]{line}[/green]")
-                        elif line.startswith('-'):
-                            self.console.print(f"[red]{line}[/red]")
-                        else:
-                            self.console.print(f"[dim]{line}[/dim]")
+                    self.console.print(diff)
                     self.console.print("-" * 60)
-                    input("\nPress Enter to continue...")
+                    self._ask("\nPress Enter to continue...")
                 else:
                     self.console.print("[yellow]No diff available for this file.[/yellow]")
             else:
@@ -1083,58 +2329,57 @@ class Monitor:
         except ValueError:
             self.console.print("[red]Invalid input. Please enter a number.[/red]")
             
-    def _input_handler(self):
-        """Cross-platform input handler using prompt_toolkit"""
-        if not self.running:
-            return
-            
+    def _build_key_bindings(self):
+        """Navigation keys for the monitor view, built once and reused on every resume"""
         bindings = KeyBindings()
         
         @bindings.add('w')
         @bindings.add('W')
         @bindings.add(Keys.Up)
         def scroll_up_handler(event):
-            self._scroll_up()
+            self._post(self._scroll_up)
         
         @bindings.add('s')
         @bindings.add('S')
         @bindings.add(Keys.Down)
         def scroll_down_handler(event):
-            self._scroll_down()
+            self._post(self._scroll_down)
         
         @bindings.add(Keys.PageUp)
         def page_up_handler(event):
-            self._page_up()
+            self._post(self._page_up)
         
         @bindings.add(Keys.PageDown)
         def page_down_handler(event):
-            self._page_down()
+            self._post(self._page_down)
         
         @bindings.add('f')
         @bindings.add('F')
         def jump_handler(event):
-            self._jump_to_recent_file()
+            self._post(self._jump_to_recent_file)
             
         @bindings.add('m')
         @bindings.add('M')
-        def menu_handler(event):
-            # Signal to show the menu and exit this handler
-            with self.state_lock:
-                self.show_menu_event.set()
-            event.app.exit()
-        
         @bindings.add(Keys.Escape)
-        def escape_handler(event):
-            # Alternative way to access menu
+        def menu_handler(event):
+            # Signal to show the menu and exit the key handler, Escape is an alternative way in
             with self.state_lock:
                 self.show_menu_event.set()
+            self._post(self._redraw)
             event.app.exit()
         
+        return bindings
+    
+    def _input_handler(self):
+        """Cross-platform input handler using prompt_toolkit"""
+        if not self.running:
+            return
+            
         self.ptk_running = True
         
         app = Application(
             layout=PTKLayout(Window()),
-            key_bindings=bindings,
+            key_bindings=self._key_bindings,
             full_screen=False,
             mouse_support=False,
             output=None,
@@ -1166,17 +2411,21 @@ class Monitor:
     
     def _scroll_up(self):
         self.scroll_offset = max(0, self.scroll_offset - 5)
+        self._dirty = True
     
     def _scroll_down(self):
         max_scroll = max(0, self.tree_height - self.visible_lines)
         self.scroll_offset = min(max_scroll, self.scroll_offset + 5)
+        self._dirty = True
     
     def _page_up(self):
         self.scroll_offset = max(0, self.scroll_offset - self.visible_lines)
+        self._dirty = True
     
     def _page_down(self):
         max_scroll = max(0, self.tree_height - self.visible_lines)
         self.scroll_offset = min(max_scroll, self.scroll_offset + self.visible_lines)
+        self._dirty = True
     
     def _jump_to_recent_file(self):
         if not self.most_recent_file:
@@ -1188,23 +2437,42 @@ class Monitor:
                 # Set scroll offset to show the recent file, with some context above
                 context_lines = min(5, self.visible_lines // 4)
                 self.scroll_offset = max(0, file_position - context_lines)
+                self._dirty = True
         except Exception:
             pass
     
+    def _name_index(self):
+        """(name, row) pairs of the whole tree in sorted order, rebuilt only when the walk produced new rows"""
+        items = self._subtree_items(str(self.dir), 0, 10)
+        if self._names_source is not items:
+            self._by_name = sorted(zip((item_info['name'] for item_info in items), range(len(items))))
+            self._names_source = items
+        return self._by_name
+    
     def _find_file_position(self, filename):
         try:
-            tree_items = []
-            self._collect_tree_items(self.dir, tree_items)
-            
-            for i, item_info in enumerate(tree_items):
-                if item_info['path'].name == filename:
-                    return i
+            by_name = self._name_index()
+            # Equal names sort by row, so this lands on the first occurrence
+            i = bisect_left(by_name, (filename,))
+            if i < len(by_name) and by_name[i][0] == filename:
+                return by_name[i][1]
             return None
         except Exception:
             return None
 
 
 def main():
+    parser = argparse.ArgumentParser(description="File System Activity Monitor")
+    parser.add_argument("--debounce", type=int, default=int(_DEBOUNCE_SECONDS * 1000), metavar="MS",
+                        help="quiet period in milliseconds before redrawing after changes (default: %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=_POLL_INTERVAL, metavar="SECONDS",
+                        help="how often to rescan directories on network filesystems (default: %(default)s)")
+    parser.add_argument("--include", action="append", default=[], metavar="DIR",
+                        help="only watch this subdirectory of the monitored directory for events (repeatable)")
+    parser.add_argument("--persist-cache", action="store_true",
+                        help="keep file contents between runs so unchanged files aren't re-read at startup")
+    args = parser.parse_args()
+    
     os.system('cls' if os.name == 'nt' else 'clear')
     console = Console()
     
@@ -1261,7 +2529,9 @@ def main():
     console.print("\n[dim]Starting monitor...[/dim]")
     
     try:
-        monitor = Monitor(str(path), enable_chime=chime)
+        monitor = Monitor(str(path), enable_chime=chime, debounce=max(0, args.debounce) / 1000,
+                          persist=args.persist_cache, poll_interval=max(0.1, args.poll_interval),
+                          include_dirs=args.include)
         monitor.run()
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")